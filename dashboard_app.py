@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import bisect
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
 import streamlit as st
 
-from isf_simulation import ISFFeed, ISFFurnace, ISFOperatingConditions
+from isf_simulation import ISFOperatingConditions
+from isf_ui import INPUT_DECIMALS, WTFRAC_DECIMALS, get_furnace, normalised_feed
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 st.set_page_config(
@@ -27,30 +33,48 @@ def run_single_simulation(
     zn_target_tph: float,
     coke_lhv_MJ_per_kg: float,
 ):
-    elements_wtfrac = {
-        "Zn": zn_wtfrac,
-        "Pb": pb_wtfrac,
-        "Fe": fe_wtfrac,
-        "S": s_wtfrac,
-        "Si": si_wtfrac,
-        "Ca": ca_wtfrac,
-        "Mg": mg_wtfrac,
-        "O": o_wtfrac,
-    }
-    # Normalise in case the user changed values a lot
-    total = sum(elements_wtfrac.values())
-    if total > 0:
-        elements_wtfrac = {k: v / total for k, v in elements_wtfrac.items()}
-
-    feed = ISFFeed(elements_wtfrac=elements_wtfrac, feed_rate_tph=feed_rate_tph)
+    return _cached_single_simulation(
+        feed_rate_tph=round(feed_rate_tph, INPUT_DECIMALS),
+        zn_wtfrac=round(zn_wtfrac, WTFRAC_DECIMALS),
+        pb_wtfrac=round(pb_wtfrac, WTFRAC_DECIMALS),
+        fe_wtfrac=round(fe_wtfrac, WTFRAC_DECIMALS),
+        s_wtfrac=round(s_wtfrac, WTFRAC_DECIMALS),
+        si_wtfrac=round(si_wtfrac, WTFRAC_DECIMALS),
+        ca_wtfrac=round(ca_wtfrac, WTFRAC_DECIMALS),
+        mg_wtfrac=round(mg_wtfrac, WTFRAC_DECIMALS),
+        o_wtfrac=round(o_wtfrac, WTFRAC_DECIMALS),
+        coke_rate_kgph=round(coke_rate_kgph, INPUT_DECIMALS),
+        zn_target_tph=round(zn_target_tph, INPUT_DECIMALS),
+        coke_lhv_MJ_per_kg=round(coke_lhv_MJ_per_kg, INPUT_DECIMALS),
+    )
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _cached_single_simulation(
+    feed_rate_tph: float,
+    zn_wtfrac: float,
+    pb_wtfrac: float,
+    fe_wtfrac: float,
+    s_wtfrac: float,
+    si_wtfrac: float,
+    ca_wtfrac: float,
+    mg_wtfrac: float,
+    o_wtfrac: float,
+    coke_rate_kgph: float,
+    zn_target_tph: float,
+    coke_lhv_MJ_per_kg: float,
+):
+    feed = normalised_feed(
+        feed_rate_tph,
+        (zn_wtfrac, pb_wtfrac, fe_wtfrac, s_wtfrac, si_wtfrac, ca_wtfrac, mg_wtfrac, o_wtfrac),
+    )
     op = ISFOperatingConditions(
         coke_rate_kgph=coke_rate_kgph,
         zn_production_target_tph=zn_target_tph,
         coke_LHV_MJ_per_kg=coke_lhv_MJ_per_kg,
     )
 
-    furnace = ISFFurnace()
-    result = furnace.simulate(feed, op)
+    result = get_furnace().simulate(feed, op)
 
     zn_recovery = result.kpi_zinc_recovery()
     coke_intensity = result.kpi_coke_rate_GJ_per_tZn()
@@ -59,66 +83,100 @@ def run_single_simulation(
     return result, zn_recovery, coke_intensity, zn_prod_tph
 
 
+def run_coke_sweep(
+    feed_rate_tph: float,
+    zn_wtfrac: float,
+    pb_wtfrac: float,
+    fe_wtfrac: float,
+    s_wtfrac: float,
+    si_wtfrac: float,
+    ca_wtfrac: float,
+    mg_wtfrac: float,
+    o_wtfrac: float,
+    coke_rates_kgph: np.ndarray,
+    coke_lhv_MJ_per_kg: float,
+) -> pd.DataFrame:
+    """KPIs across a range of coke rates, evaluated in a single batched call."""
+    # Imported here so the sidebar renders before pandas has finished loading
+    import pandas as pd
+
+    feed = normalised_feed(
+        feed_rate_tph,
+        (zn_wtfrac, pb_wtfrac, fe_wtfrac, s_wtfrac, si_wtfrac, ca_wtfrac, mg_wtfrac, o_wtfrac),
+    )
+    zn_recovery, coke_intensity, zn_prod_tph = get_furnace().simulate_coke_sweep(
+        feed, coke_rates_kgph, coke_lhv_MJ_per_kg
+    )
+
+    return pd.DataFrame(
+        {
+            "Zinc recovery (%)": zn_recovery,
+            "Coke energy intensity (GJ/t Zn)": coke_intensity,
+            "Zn production (t/h)": zn_prod_tph,
+        },
+        index=pd.Index(coke_rates_kgph, name="Coke rate (kg/h)"),
+        copy=False,
+    )
+
+
+# Recommendation bands: messages are indexed by the band a KPI falls into.
+# Zinc recovery (%): < 85, 85–92, >= 92
+_REC_RECOVERY_BANDS = (85.0, 92.0)
+_REC_RECOVERY_MSGS = (
+    "Zinc recovery is relatively low. Consider improving feed preparation "
+    "(e.g. sinter quality, temperature profile) or adjusting furnace conditions "
+    "to increase metal recovery.",
+    "Zinc recovery is moderate. Small improvements in operating practice or "
+    "feed quality could push recovery into a higher performance band.",
+    "Zinc recovery is high. Focus on maintaining stable operating conditions "
+    "and monitoring for early signs of deterioration.",
+)
+
+# Coke energy intensity (GJ/t Zn): <= 0 (no message), (0, 3.5], (3.5, 4.5], > 4.5
+_REC_COKE_BANDS = (0.0, 3.5, 4.5)
+_REC_COKE_MSGS = (
+    None,
+    "Coke energy intensity is relatively low for the assumed zinc output. "
+    "Ensure that this is sustainable and does not compromise furnace stability.",
+    "Coke energy intensity is acceptable but could likely be reduced. "
+    "Consider optimisation trials with slightly lower coke rates.",
+    "Coke energy intensity is high. Investigate opportunities to reduce coke "
+    "rate (better air distribution, burden distribution, or heat recovery) "
+    "while maintaining metal quality.",
+)
+
+# Zinc production as a fraction of target: < 0.9, 0.9–1.1 (inclusive), > 1.1
+_REC_PRODUCTION_BANDS = (0.9, 1.1)
+_REC_PRODUCTION_MSGS = (
+    "Simulated zinc production is well below the target. Consider increasing "
+    "feed rate, improving recovery, or revisiting the production target.",
+    "Simulated zinc production is close to the target, which indicates a "
+    "good match between furnace operation and planning assumptions.",
+    "Simulated zinc production is above the target. This may be acceptable, "
+    "but confirm that downstream units can handle the extra throughput.",
+)
+
+
 def build_recommendations(
     zn_recovery: float,
     coke_intensity: float,
     zn_prod_tph: float,
     zn_target_tph: float,
 ):
-    recs: list[str] = []
-
     # Recovery-focused recommendations
-    if zn_recovery < 85.0:
-        recs.append(
-            "Zinc recovery is relatively low. Consider improving feed preparation "
-            "(e.g. sinter quality, temperature profile) or adjusting furnace conditions "
-            "to increase metal recovery."
-        )
-    elif zn_recovery < 92.0:
-        recs.append(
-            "Zinc recovery is moderate. Small improvements in operating practice or "
-            "feed quality could push recovery into a higher performance band."
-        )
-    else:
-        recs.append(
-            "Zinc recovery is high. Focus on maintaining stable operating conditions "
-            "and monitoring for early signs of deterioration."
-        )
+    recs: list[str] = [
+        _REC_RECOVERY_MSGS[bisect.bisect_right(_REC_RECOVERY_BANDS, zn_recovery)]
+    ]
 
-    # Energy / coke intensity recommendations
-    if coke_intensity > 4.5:
-        recs.append(
-            "Coke energy intensity is high. Investigate opportunities to reduce coke "
-            "rate (better air distribution, burden distribution, or heat recovery) "
-            "while maintaining metal quality."
-        )
-    elif coke_intensity > 3.5:
-        recs.append(
-            "Coke energy intensity is acceptable but could likely be reduced. "
-            "Consider optimisation trials with slightly lower coke rates."
-        )
-    elif coke_intensity > 0.0:
-        recs.append(
-            "Coke energy intensity is relatively low for the assumed zinc output. "
-            "Ensure that this is sustainable and does not compromise furnace stability."
-        )
+    # Energy / coke intensity recommendations (upper band edges are inclusive)
+    coke_msg = _REC_COKE_MSGS[bisect.bisect_left(_REC_COKE_BANDS, coke_intensity)]
+    if coke_msg is not None:
+        recs.append(coke_msg)
 
-    # Production vs target
-    if zn_prod_tph < 0.9 * zn_target_tph:
-        recs.append(
-            "Simulated zinc production is well below the target. Consider increasing "
-            "feed rate, improving recovery, or revisiting the production target."
-        )
-    elif zn_prod_tph > 1.1 * zn_target_tph:
-        recs.append(
-            "Simulated zinc production is above the target. This may be acceptable, "
-            "but confirm that downstream units can handle the extra throughput."
-        )
-    else:
-        recs.append(
-            "Simulated zinc production is close to the target, which indicates a "
-            "good match between furnace operation and planning assumptions."
-        )
+    # Production vs target (the "close to target" band includes both edges)
+    low, high = _REC_PRODUCTION_BANDS
+    band = (zn_prod_tph >= low * zn_target_tph) + (zn_prod_tph > high * zn_target_tph)
+    recs.append(_REC_PRODUCTION_MSGS[band])
 
     return recs
 
@@ -193,14 +251,31 @@ def main():
 
     st.markdown("---")
 
-    # Generate a coke-rate sweep around the selected operating point
-    sweep_min = max(5000.0, coke_rate_kgph * 0.6)
-    sweep_max = coke_rate_kgph * 1.4
-    sweep_rates = np.linspace(sweep_min, sweep_max, num_scenarios)
+    # Generate a coke-rate sweep around the selected operating point. The
+    # last sweep is kept in session state and reused while its inputs are
+    # unchanged (e.g. when only a downstream widget triggered the rerun).
+    sweep_key = (
+        feed_rate_tph,
+        zn_wtfrac,
+        pb_wtfrac,
+        fe_wtfrac,
+        s_wtfrac,
+        si_wtfrac,
+        ca_wtfrac,
+        mg_wtfrac,
+        o_wtfrac,
+        coke_rate_kgph,
+        coke_lhv,
+        num_scenarios,
+    )
+    if st.session_state.get("sweep_key") == sweep_key:
+        df = st.session_state["sweep_df"]
+    else:
+        sweep_min = max(5000.0, coke_rate_kgph * 0.6)
+        sweep_max = coke_rate_kgph * 1.4
+        sweep_rates = np.linspace(sweep_min, sweep_max, num_scenarios)
 
-    records = []
-    for rate in sweep_rates:
-        _, zn_rec, coke_int, zn_prod = run_single_simulation(
+        df = run_coke_sweep(
             feed_rate_tph=feed_rate_tph,
             zn_wtfrac=zn_wtfrac,
             pb_wtfrac=pb_wtfrac,
@@ -210,20 +285,11 @@ def main():
             ca_wtfrac=ca_wtfrac,
             mg_wtfrac=mg_wtfrac,
             o_wtfrac=o_wtfrac,
-            coke_rate_kgph=float(rate),
-            zn_target_tph=zn_target_tph,
+            coke_rates_kgph=sweep_rates,
             coke_lhv_MJ_per_kg=coke_lhv,
         )
-        records.append(
-            {
-                "Coke rate (kg/h)": float(rate),
-                "Zinc recovery (%)": zn_rec,
-                "Coke energy intensity (GJ/t Zn)": coke_int,
-                "Zn production (t/h)": zn_prod,
-            }
-        )
-
-    df = pd.DataFrame.from_records(records)
+        st.session_state["sweep_key"] = sweep_key
+        st.session_state["sweep_df"] = df
 
     # Graphs section
     st.subheader("KPI trends vs coke rate")
@@ -232,19 +298,19 @@ def main():
     with graph_col1:
         st.caption("Zinc recovery vs coke rate")
         st.line_chart(
-            df.set_index("Coke rate (kg/h)")[["Zinc recovery (%)"]],
+            df[["Zinc recovery (%)"]],
             height=300,
         )
 
     with graph_col2:
         st.caption("Coke energy intensity vs coke rate")
         st.line_chart(
-            df.set_index("Coke rate (kg/h)")[["Coke energy intensity (GJ/t Zn)"]],
+            df[["Coke energy intensity (GJ/t Zn)"]],
             height=300,
         )
 
     st.subheader("Simulation table")
-    st.dataframe(df.style.format(precision=2), use_container_width=True)
+    st.dataframe(df.style.format(precision=2).format_index(precision=2), use_container_width=True)
 
     # Recommendations
     st.subheader("Recommendations")
@@ -6,6 +6,8 @@ Imperial Smelting Furnace (zinc/lead plant).
 """
 
 from .model import (
+    ELEMENTS,
+    TABLE_ORDER,
     Stream,
     ISFFeed,
     ISFOperatingConditions,
@@ -15,9 +17,12 @@ from .model import (
     ISFOperatingLimits,
     ISFComplianceResult,
     evaluate_sop_compliance,
+    normalise_fractions,
 )
 
 __all__ = [
+    "ELEMENTS",
+    "TABLE_ORDER",
     "Stream",
     "ISFFeed",
     "ISFOperatingConditions",
@@ -27,5 +32,6 @@ __all__ = [
     "ISFOperatingLimits",
     "ISFComplianceResult",
     "evaluate_sop_compliance",
+    "normalise_fractions",
 ]
 
@@ -1,29 +1,99 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
 
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to plain NumPy
+    def njit(**_kwargs):
+        def decorator(func):
+            return func
 
-ElementMass = Dict[str, float]  # kg/h of each element
+        return decorator
 
 
-@dataclass
+# Fixed element order used for all stream mass-flow vectors. Feed elements
+# not listed here are lumped into "Other" and treated as gangue.
+ELEMENTS: Tuple[str, ...] = ("Zn", "Pb", "Fe", "S", "Si", "Ca", "Mg", "Al", "O", "C", "Ash", "Other")
+IDX: Dict[str, int] = {el: i for i, el in enumerate(ELEMENTS)}
+
+# Permutation of ELEMENTS into alphabetical order, the row order of the
+# stream tables in every front end
+TABLE_ORDER = np.argsort(ELEMENTS)
+TABLE_ORDER.flags.writeable = False
+
+# Elements without an explicit distribution rule (gangue etc.)
+GANGUE_MASK = np.array([el not in {"Zn", "Pb", "Fe", "S", "C", "O"} for el in ELEMENTS])
+GANGUE_MASK.flags.writeable = False
+
+ElementMass = np.ndarray  # kg/h of each element, ordered as ELEMENTS
+
+# Simple fixed coke composition (mass fractions); Ash goes to slag as gangue
+_COKE_WTFRAC = {"C": 0.90, "S": 0.01, "Ash": 0.09}
+COKE_WTFRAC_ARR = np.array([_COKE_WTFRAC.get(el, 0.0) for el in ELEMENTS])
+COKE_WTFRAC_ARR.flags.writeable = False
+
+
+@lru_cache(maxsize=128)
+def _wtfrac_vector(items: Tuple[Tuple[str, float], ...]) -> np.ndarray:
+    """
+    Read-only mass-fraction vector, ordered as ``ELEMENTS``, for a composition.
+
+    Elements outside ``ELEMENTS`` are summed into the "Other" (gangue) slot.
+    """
+    wtfracs = np.zeros(len(ELEMENTS))
+    for el, wtfrac in items:
+        wtfracs[IDX.get(el, IDX["Other"])] += wtfrac
+    wtfracs.flags.writeable = False
+    return wtfracs
+
+
+@njit(cache=True)
+def normalise_fractions(raw: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Scale amounts (e.g. wt%) to fractions that sum to 1.
+
+    Negative entries are clipped to zero first. Returns the fractions and the
+    clipped total; an all-zero input gives all-zero fractions.
+    """
+    clipped = np.maximum(raw, 0.0)
+    total = clipped.sum()
+    inv_total = 1.0 / total if total > 0.0 else 0.0
+    return clipped * inv_total, total
+
+
+@dataclass(slots=True, eq=False)
 class Stream:
-    """Generic stream with element-wise mass flows (kg/h)."""
+    """Generic stream with element-wise mass flows (kg/h), ordered as ``ELEMENTS``."""
 
     name: str
     elements_kgph: ElementMass
 
+    # The generated __eq__ would compare arrays inside a tuple, which raises
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Stream):
+            return NotImplemented
+        return self.name == other.name and np.array_equal(self.elements_kgph, other.elements_kgph)
+
+    __hash__ = None  # mutable, like the other (eq=True) dataclasses
+
     def total_mass_flow(self) -> float:
-        return float(sum(self.elements_kgph.values()))
+        return float(self.elements_kgph.sum())
 
     def element(self, symbol: str) -> float:
-        return float(self.elements_kgph.get(symbol, 0.0))
+        i = IDX.get(symbol)
+        return float(self.elements_kgph[i]) if i is not None else 0.0
 
+    def as_dict(self) -> Dict[str, float]:
+        """Mass flows keyed by element symbol, for elements with non-zero flow."""
+        return {el: float(m) for el, m in zip(ELEMENTS, self.elements_kgph) if m != 0.0}
 
-@dataclass
+
+@dataclass(slots=True)
 class ISFFeed:
     """
     ISF feed description (sinter or mixture of feeds).
@@ -35,15 +105,30 @@ class ISFFeed:
     elements_wtfrac: Dict[str, float]
     feed_rate_tph: float
 
+    @classmethod
+    def from_array(
+        cls,
+        wtfracs: np.ndarray,
+        names: Sequence[str],
+        feed_rate_tph: float,
+    ) -> ISFFeed:
+        """
+        Build a feed from mass fractions listed in the same order as ``names``.
+
+        Raises ValueError if ``wtfracs`` and ``names`` differ in length.
+        """
+        return cls(
+            elements_wtfrac=dict(zip(names, np.asarray(wtfracs, dtype=np.float64).tolist(), strict=True)),
+            feed_rate_tph=feed_rate_tph,
+        )
+
     def to_stream(self, name: str = "Feed") -> Stream:
         total_kgph = self.feed_rate_tph * 1000.0
-        elements_kgph = {
-            el: wtfrac * total_kgph for el, wtfrac in self.elements_wtfrac.items()
-        }
+        elements_kgph = _wtfrac_vector(tuple(self.elements_wtfrac.items())) * total_kgph
         return Stream(name=name, elements_kgph=elements_kgph)
 
 
-@dataclass
+@dataclass(slots=True)
 class ISFOperatingConditions:
     """
     Operating conditions relevant for simple KPIs and SOP checks.
@@ -67,12 +152,14 @@ class ISFOperatingConditions:
     lead_splash_temp_C: float | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ISFRecoveryParameters:
     """
     Simple recovery and distribution parameters.
 
     Values represent fractions (0–1) of each element reporting to each product.
+    Instances are immutable (and hashable), so a furnace built from them can
+    precompute its distribution fractions safely.
     """
 
     zn_to_metal: float = 0.92
@@ -93,7 +180,7 @@ class ISFRecoveryParameters:
     gangue_to_slag: float = 0.995  # Si, Ca, Mg, Al etc.
 
 
-@dataclass
+@dataclass(slots=True)
 class ISFSimulationResult:
     feed: Stream
     coke: Stream
@@ -123,7 +210,7 @@ class ISFSimulationResult:
         return self.metal.element("Zn") / 1000.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ISFOperatingLimits:
     """
     SOP-based operating limits for key ISF parameters.
@@ -149,7 +236,7 @@ class ISFOperatingLimits:
     zinc_product_purity_min_wtfrac: float = 0.995  # ≥99.5 % Zn
 
 
-@dataclass
+@dataclass(slots=True)
 class ISFComplianceResult:
     """Summary of how a simulation compares to SOP limits."""
 
@@ -226,11 +313,48 @@ def evaluate_sop_compliance(
         lead_splash_temp_within_spec=lead_ok,
     )
 
-    def zn_metal_production_tph(self) -> float:
-        """
-        Actual zinc metal production rate based on the simulated metal stream.
-        """
-        return self.metal.element("Zn") / 1000.0
+
+def _simulate_core(
+    feed_arr: np.ndarray,
+    coke_arr: np.ndarray,
+    dist_frac: np.ndarray,
+) -> np.ndarray:
+    """
+    Split the combined feed + coke input into metal, slag and off‑gas rows.
+
+    ``dist_frac`` stacks the metal, slag and gas fractions as a (3, N) array,
+    so the split is a single broadcast multiply. Plain NumPy on purpose: for
+    vectors this short a JIT version is no faster and only adds compile time.
+    """
+    return (feed_arr + coke_arr) * dist_frac
+
+
+@njit(cache=True)
+def _simulate_sweep(
+    feed_arr: np.ndarray,
+    coke_unit_arr: np.ndarray,
+    coke_rates: np.ndarray,
+    metal_frac: np.ndarray,
+    coke_LHV: float,
+    zn_idx: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Zinc KPIs for each coke rate, without building intermediate streams.
+
+    ``coke_unit_arr`` is the coke element vector for 1 kg/h of coke. Written
+    as whole-array expressions so it stays vectorised when Numba is absent.
+    """
+    feed_zn = feed_arr[zn_idx]
+    metal_zn = (feed_zn + coke_unit_arr[zn_idx] * coke_rates) * metal_frac[zn_idx]
+    zn_prod = metal_zn / 1000.0
+    if feed_zn > 0.0:
+        zn_rec = 100.0 * metal_zn / feed_zn
+    else:
+        zn_rec = np.zeros_like(coke_rates)
+    # Divide by 1.0 where no zinc is produced, then mask those points to 0
+    has_zn = zn_prod > 0.0
+    coke_int = np.where(has_zn, (coke_rates * coke_LHV / 1000.0) / np.where(has_zn, zn_prod, 1.0), 0.0)
+    return zn_rec, coke_int, zn_prod
 
 
 class ISFFurnace:
@@ -239,6 +363,9 @@ class ISFFurnace:
 
     This is a lumped, element‑wise mass balance model with
     user‑defined recovery/distribution fractions.
+
+    The per-element distribution fractions are derived from ``recoveries``
+    once, at construction; build a new furnace to use different recoveries.
     """
 
     def __init__(
@@ -246,6 +373,8 @@ class ISFFurnace:
         recoveries: ISFRecoveryParameters | None = None,
     ) -> None:
         self.recoveries = recoveries or ISFRecoveryParameters()
+        self._metal_frac, self._slag_frac, self._gas_frac = self._distribution_fractions()
+        self._dist_frac = np.stack((self._metal_frac, self._slag_frac, self._gas_frac))
 
     def simulate(
         self,
@@ -255,89 +384,90 @@ class ISFFurnace:
         feed_stream = feed.to_stream("Feed")
         coke_stream = self._make_coke_stream(op.coke_rate_kgph)
 
-        total_feed_elements = self._combine_streams([feed_stream, coke_stream])
+        metal_elements, slag_elements, gas_elements = _simulate_core(
+            feed_stream.elements_kgph,
+            coke_stream.elements_kgph,
+            self._dist_frac,
+        )
+
+        metal_stream = Stream("Metal", metal_elements)
+        slag_stream = Stream("Slag", slag_elements)
+        gas_stream = Stream("Off‑gas", gas_elements)
+
+        return ISFSimulationResult(
+            feed=feed_stream,
+            coke=coke_stream,
+            metal=metal_stream,
+            slag=slag_stream,
+            gas=gas_stream,
+            operating=op,
+            recoveries=self.recoveries,
+        )
+
+    def simulate_coke_sweep(
+        self,
+        feed: ISFFeed,
+        coke_rates_kgph: np.ndarray,
+        coke_LHV_MJ_per_kg: float = 28.0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate zinc KPIs over a range of coke rates.
 
-        metal_elements: ElementMass = {}
-        slag_elements: ElementMass = {}
-        gas_elements: ElementMass = {}
+        Returns arrays of zinc recovery (%), coke energy intensity (GJ/t Zn)
+        and zinc metal production (t/h), one entry per coke rate, matching the
+        corresponding ``ISFSimulationResult`` KPIs from ``simulate``.
+        """
+        return _simulate_sweep(
+            feed.to_stream("Feed").elements_kgph,
+            COKE_WTFRAC_ARR,
+            np.asarray(coke_rates_kgph, dtype=np.float64),
+            self._metal_frac,
+            float(coke_LHV_MJ_per_kg),
+            IDX["Zn"],
+        )
+
+    def _distribution_fractions(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Fractions of each element (ordered as ``ELEMENTS``) reporting to
+        metal, slag and off‑gas.
+        """
+        r = self.recoveries
+        metal_frac = np.zeros(len(ELEMENTS))
+        slag_frac = np.zeros(len(ELEMENTS))
+        gas_frac = np.zeros(len(ELEMENTS))
 
         # Handle key elements explicitly
-        zn = total_feed_elements.get("Zn", 0.0)
-        pb = total_feed_elements.get("Pb", 0.0)
-        fe = total_feed_elements.get("Fe", 0.0)
-        s = total_feed_elements.get("S", 0.0)
+        zn, pb, fe, s = IDX["Zn"], IDX["Pb"], IDX["Fe"], IDX["S"]
 
         # Zinc
-        metal_elements["Zn"] = zn * self.recoveries.zn_to_metal
-        slag_elements["Zn"] = zn * self.recoveries.zn_to_slag
-        gas_elements["Zn"] = zn * self.recoveries.zn_to_gas
+        metal_frac[zn] = r.zn_to_metal
+        slag_frac[zn] = r.zn_to_slag
+        gas_frac[zn] = r.zn_to_gas
 
         # Lead
-        metal_elements["Pb"] = pb * self.recoveries.pb_to_metal
-        slag_elements["Pb"] = pb * self.recoveries.pb_to_slag
-        gas_elements["Pb"] = pb * self.recoveries.pb_to_gas
+        metal_frac[pb] = r.pb_to_metal
+        slag_frac[pb] = r.pb_to_slag
+        gas_frac[pb] = r.pb_to_gas
 
         # Iron
-        metal_elements["Fe"] = fe * self.recoveries.fe_to_metal
-        slag_elements["Fe"] = fe * self.recoveries.fe_to_slag
-        gas_elements["Fe"] = fe * self.recoveries.fe_to_gas
+        metal_frac[fe] = r.fe_to_metal
+        slag_frac[fe] = r.fe_to_slag
+        gas_frac[fe] = r.fe_to_gas
 
         # Sulphur
-        slag_elements["S"] = s * self.recoveries.s_to_slag
-        gas_elements["S"] = s * self.recoveries.s_to_gas
+        slag_frac[s] = r.s_to_slag
+        gas_frac[s] = r.s_to_gas
 
         # Treat all other elements (gangue etc.) as going mostly to slag
-        gangue_elements = {
-            el: m
-            for el, m in total_feed_elements.items()
-            if el not in {"Zn", "Pb", "Fe", "S", "C", "O"}
-        }
-        for el, m in gangue_elements.items():
-            to_slag = m * self.recoveries.gangue_to_slag
-            to_gas = m - to_slag
-            slag_elements[el] = slag_elements.get(el, 0.0) + to_slag
-            gas_elements[el] = gas_elements.get(el, 0.0) + to_gas
+        slag_frac[GANGUE_MASK] = r.gangue_to_slag
+        gas_frac[GANGUE_MASK] = 1.0 - r.gangue_to_slag
 
         # Carbon and oxygen from coke → all to gas (CO, CO2)
-        c = total_feed_elements.get("C", 0.0)
-        o = total_feed_elements.get("O", 0.0)
-        gas_elements["C"] = gas_elements.get("C", 0.0) + c
-        gas_elements["O"] = gas_elements.get("O", 0.0) + o
+        gas_frac[IDX["C"]] = 1.0
+        gas_frac[IDX["O"]] = 1.0
 
-        metal_stream = Stream("Metal", metal_elements)
-        slag_stream = Stream("Slag", slag_elements)
-        gas_stream = Stream("Off‑gas", gas_elements)
-
-        return ISFSimulationResult(
-            feed=feed_stream,
-            coke=coke_stream,
-            metal=metal_stream,
-            slag=slag_stream,
-            gas=gas_stream,
-            operating=op,
-            recoveries=self.recoveries,
-        )
+        return metal_frac, slag_frac, gas_frac
 
     @staticmethod
     def _make_coke_stream(coke_rate_kgph: float) -> Stream:
-        # Simple fixed coke composition (mass fractions)
-        wtfrac = {
-            "C": 0.90,
-            "S": 0.01,
-            "Ash": 0.09,  # goes to slag as gangue
-        }
-        elements_kgph: ElementMass = {
-            "C": wtfrac["C"] * coke_rate_kgph,
-            "S": wtfrac["S"] * coke_rate_kgph,
-            "Ash": wtfrac["Ash"] * coke_rate_kgph,
-        }
-        return Stream(name="Coke", elements_kgph=elements_kgph)
-
-    @staticmethod
-    def _combine_streams(streams: List[Stream]) -> ElementMass:
-        combined: ElementMass = {}
-        for s in streams:
-            for el, m in s.elements_kgph.items():
-                combined[el] = combined.get(el, 0.0) + m
-        return combined
-
+        return Stream(name="Coke", elements_kgph=COKE_WTFRAC_ARR * coke_rate_kgph)
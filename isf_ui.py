@@ -0,0 +1,485 @@
+"""
+Shared Streamlit building blocks for the ISF web apps.
+
+Cached resources, the sidebar inputs and the render helpers live here so
+that every entry point shares one set of caches.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import streamlit as st
+
+from isf_simulation import (
+    ELEMENTS,
+    TABLE_ORDER,
+    ISFComplianceResult,
+    ISFFeed,
+    ISFFurnace,
+    ISFOperatingConditions,
+    ISFOperatingLimits,
+    ISFRecoveryParameters,
+    ISFSimulationResult,
+    evaluate_sop_compliance,
+    normalise_fractions,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Order of the feed-composition sliders in the sidebar
+FEED_ELEMENTS = ("Zn", "Pb", "Fe", "S", "Si", "Ca", "Mg", "O")
+
+# Element labels in stream-table row order (alphabetical, see TABLE_ORDER)
+_TABLE_ELEMENTS = np.asarray(ELEMENTS)[TABLE_ORDER]
+
+
+@st.cache_resource
+def get_furnace(recoveries: ISFRecoveryParameters | None = None) -> ISFFurnace:
+    """
+    Shared furnace model, built once per server process for each distinct
+    set of recovery parameters (the default set when ``recoveries`` is None).
+    """
+    return ISFFurnace(recoveries)
+
+
+@st.cache_resource
+def get_limits() -> ISFOperatingLimits:
+    """SOP operating limits (ISF-SOP-001 defaults), built once per server process."""
+    return ISFOperatingLimits()
+
+
+# Global CSS for page chrome and KPI styling,
+# inspired by the ISF Zinc Operations web dashboard.
+@st.cache_resource
+def _page_css() -> str:
+    return """
+    <style>
+    body {
+        background-color: #020617;
+        color: #1d4ed8; /* default text blue */
+    }
+    .page-header {
+        padding: 0.75rem 0 1.25rem 0;
+        border-bottom: 1px solid #1f2937;
+        margin-bottom: 1rem;
+    }
+    .page-header h1 {
+        margin-bottom: 0.15rem;
+        font-size: 1.8rem;
+        color: #1d4ed8;
+    }
+    .page-header p {
+        color: #3b82f6;
+        font-size: 0.95rem;
+        margin-bottom: 0;
+    }
+
+    [data-testid="stMetric"] {
+        background: #020617;
+        border-radius: 0.75rem;
+        padding: 0.75rem 1rem;
+        border: 1px solid #1f2937;
+        margin-bottom: 0.75rem;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.45);
+    }
+    [data-testid="stMetricLabel"] {
+        font-size: 0.8rem;
+        text-transform: uppercase;
+        letter-spacing: 0.06em;
+        color: #60a5fa;
+    }
+    [data-testid="stMetricValue"] {
+        font-size: 1.4rem;
+        font-weight: 600;
+        color: #1d4ed8;
+    }
+
+    .section-title {
+        margin-top: 1.5rem;
+        margin-bottom: 0.5rem;
+        color: #1d4ed8;
+    }
+
+    .stage-card {
+        background: #020617;
+        border-radius: 0.75rem;
+        padding: 0.75rem 1rem;
+        border: 1px solid #1f2937;
+        margin-bottom: 0.75rem;
+    }
+    .stage-title {
+        font-size: 0.9rem;
+        font-weight: 600;
+        color: #1d4ed8;
+        margin-bottom: 0.15rem;
+    }
+    .stage-temp {
+        font-size: 0.95rem;
+        color: #3b82f6;
+    }
+    .stage-status-normal {
+        font-size: 0.8rem;
+        color: #22c55e;
+    }
+    .stage-status-alert {
+        font-size: 0.8rem;
+        color: #f97316;
+    }
+
+    .data-table {
+        width: 100%;
+        border-collapse: collapse;
+        margin-bottom: 1rem;
+    }
+    .data-table th, .data-table td {
+        padding: 0.3rem 0.6rem;
+        border-bottom: 1px solid #1f2937;
+        text-align: left;
+    }
+
+    .footer-note {
+        margin-top: 2rem;
+        font-size: 0.8rem;
+        color: #60a5fa;
+    }
+    </style>
+    """
+
+
+def inject_css() -> None:
+    st.markdown(_page_css(), unsafe_allow_html=True)
+
+
+def normalised_feed(feed_rate_tph: float, wtfracs: tuple[float, ...]) -> ISFFeed:
+    """Feed from sidebar amounts (ordered as ``FEED_ELEMENTS``), scaled to sum to 1."""
+    # Normalise in case the user changed values a lot
+    fracs, _ = normalise_fractions(np.array(wtfracs, dtype=np.float64))
+    return ISFFeed.from_array(fracs, FEED_ELEMENTS, feed_rate_tph)
+
+
+@st.cache_data(ttl=None, max_entries=128)
+def run_simulation(
+    feed_wt_pct: tuple[float, ...],
+    feed_rate_tph: float,
+    coke_rate_kgph: float,
+    sinter_preheat_temp_C: float,
+    blast_pressure_bar: float,
+    reduction_zone_temp_C: float,
+    lead_splash_temp_C: float,
+) -> tuple[ISFSimulationResult, ISFComplianceResult]:
+    """Simulation and SOP check for one set of inputs, cached across reruns."""
+    feed = normalised_feed(feed_rate_tph, feed_wt_pct)
+    op = ISFOperatingConditions(
+        coke_rate_kgph=coke_rate_kgph,
+        zn_production_target_tph=30.0,
+        coke_LHV_MJ_per_kg=28.0,
+        sinter_preheat_temp_C=sinter_preheat_temp_C,
+        blast_pressure_bar=blast_pressure_bar,
+        reduction_zone_temp_C=reduction_zone_temp_C,
+        lead_splash_temp_C=lead_splash_temp_C,
+    )
+    result = get_furnace().simulate(feed, op)
+    return result, evaluate_sop_compliance(result, get_limits())
+
+
+# Decimal places kept for cached-simulation keys in both apps: finer than
+# any widget step, coarse enough that float noise does not cause cache misses.
+INPUT_DECIMALS = 3
+PRESSURE_DECIMALS = 4
+WTFRAC_DECIMALS = 6
+
+
+def build_sidebar() -> tuple:
+    """
+    Sidebar inputs, returned as the positional arguments of ``run_simulation``
+    (rounded so that equal-looking inputs share a cache entry).
+    """
+    limits = get_limits()
+
+    with st.sidebar:
+        st.header("Feed & Operating Conditions")
+        st.caption("Adjust the inputs, then press **Run simulation** to update the results.")
+
+        # A form batches the widgets: the page reruns once per submit,
+        # not once for every slider move.
+        with st.form("inputs"):
+            st.subheader("Sinter Feed")
+            feed_rate = st.number_input(
+                "Feed rate (t/h)", min_value=10.0, max_value=200.0, value=80.0, step=5.0, key="feed_rate"
+            )
+
+            st.markdown("**Feed composition (wt%)**")
+            zn = st.slider("Zn", 10.0, 60.0, 40.0, 1.0, key="wt_Zn")
+            pb = st.slider("Pb", 0.0, 20.0, 8.0, 0.5, key="wt_Pb")
+            fe = st.slider("Fe", 0.0, 30.0, 15.0, 0.5, key="wt_Fe")
+            s = st.slider("S", 0.0, 20.0, 10.0, 0.5, key="wt_S")
+            si = st.slider("Si", 0.0, 30.0, 12.0, 0.5, key="wt_Si")
+            ca = st.slider("Ca", 0.0, 20.0, 8.0, 0.5, key="wt_Ca")
+            mg = st.slider("Mg", 0.0, 10.0, 3.0, 0.5, key="wt_Mg")
+            o = st.slider("O", 0.0, 10.0, 4.0, 0.5, key="wt_O")
+
+            st.subheader("Coke & Key Temperatures")
+            coke_rate = st.number_input(
+                "Coke rate (kg/h)",
+                min_value=5_000.0,
+                max_value=40_000.0,
+                value=18_000.0,
+                step=1_000.0,
+                key="coke_rate",
+            )
+
+            sinter_preheat_temp = st.number_input(
+                "Sinter preheat temperature (°C)",
+                min_value=600.0,
+                max_value=900.0,
+                value=limits.sinter_preheat_temp_target_C,
+                step=5.0,
+                key="sinter_preheat_temp",
+            )
+            blast_pressure = st.number_input(
+                "Blast pressure (bar)",
+                min_value=1.0,
+                max_value=3.0,
+                value=2.0,
+                step=0.05,
+                key="blast_pressure",
+            )
+            reduction_zone_temp = st.number_input(
+                "Reduction zone temperature (°C)",
+                min_value=1100.0,
+                max_value=1400.0,
+                value=1250.0,
+                step=10.0,
+                key="reduction_zone_temp",
+            )
+            lead_splash_temp = st.number_input(
+                "Lead splash temperature (°C)",
+                min_value=400.0,
+                max_value=600.0,
+                value=500.0,
+                step=5.0,
+                key="lead_splash_temp",
+            )
+
+            st.form_submit_button("Run simulation")
+
+        raw_wt = np.array([zn, pb, fe, s, si, ca, mg, o], dtype=np.float64)
+        total_wt = raw_wt.sum()
+        if abs(total_wt - 100.0) > 1e-6:
+            st.warning(f"Current sum of wt% = {total_wt:.1f}. Values will be normalised internally.")
+
+    return (
+        tuple(raw_wt.round(INPUT_DECIMALS).tolist()),
+        round(feed_rate, INPUT_DECIMALS),
+        round(coke_rate, INPUT_DECIMALS),
+        round(sinter_preheat_temp, INPUT_DECIMALS),
+        round(blast_pressure, PRESSURE_DECIMALS),
+        round(reduction_zone_temp, INPUT_DECIMALS),
+        round(lead_splash_temp, INPUT_DECIMALS),
+    )
+
+
+@st.cache_data(max_entries=64)
+def stream_to_df(name: str, elements_kgph: tuple[float, ...]) -> pd.DataFrame:
+    """Table of a stream's non-zero flows; ``elements_kgph`` is ordered as ``ELEMENTS``."""
+    import pandas as pd
+
+    mass = np.asarray(elements_kgph)[TABLE_ORDER]
+    present = mass != 0.0
+    keys = _TABLE_ELEMENTS[present]
+    mass = mass[present]
+    total = mass.sum()
+    wt_pct = 100.0 * mass / total if total > 0 else np.zeros_like(mass)
+    df = pd.DataFrame({"Element": keys, "Mass (kg/h)": mass, "Wt %": wt_pct})
+    df.attrs["name"] = name
+    return df
+
+
+def kpi_values(result: ISFSimulationResult, compliance: ISFComplianceResult) -> list[tuple[str, str]]:
+    """(label, formatted value) for each headline KPI, in display order."""
+    return [
+        ("Zinc recovery to metal (%)", f"{result.kpi_zinc_recovery():.1f}"),
+        ("Today's Zn output (t/h)", f"{result.zn_metal_production_tph():.2f}"),
+        ("Overall energy intensity (GJ/t Zn)", f"{result.kpi_coke_rate_GJ_per_tZn():.2f}"),
+        ("Slag‑to‑feed ratio", f"{compliance.slag_to_feed_ratio:.3f}"),
+        ("Zn in slag (wt%)", f"{compliance.residual_zn_in_slag_wtfrac*100.0:.2f}"),
+        ("Zn product purity (wt%)", f"{compliance.zinc_product_purity_wtfrac*100.0:.2f}"),
+    ]
+
+
+def render_kpis(result: ISFSimulationResult, compliance: ISFComplianceResult) -> None:
+    """The KPIs as native st.metric widgets; the styled page themes them via CSS."""
+    cols = st.columns(3)
+    for i, (label, value) in enumerate(kpi_values(result, compliance)):
+        cols[i % 3].metric(label, value)
+
+
+_STATUS_CLASS = {None: "stage-status-alert", True: "stage-status-normal", False: "stage-status-alert"}
+
+
+def status_class(ok: bool | None) -> str:
+    return _STATUS_CLASS[ok]
+
+
+def render_process_flow(op: ISFOperatingConditions, compliance: ISFComplianceResult) -> None:
+    pf_col1, pf_col2, pf_col3, pf_col4 = st.columns(4)
+
+    with pf_col1:
+        st.markdown(
+            f"""
+            <div class="stage-card">
+                <div class="stage-title">Sintering</div>
+                <div class="stage-temp">{op.sinter_preheat_temp_C:.0f}°C</div>
+                <div class="{status_class(compliance.sinter_preheat_temp_within_spec)}">
+                    {"Normal" if compliance.sinter_preheat_temp_within_spec else "Check"}
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+    with pf_col2:
+        st.markdown(
+            f"""
+            <div class="stage-card">
+                <div class="stage-title">Smelting</div>
+                <div class="stage-temp">{op.reduction_zone_temp_C:.0f}°C</div>
+                <div class="{status_class(True)}">
+                    Normal
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+    with pf_col3:
+        st.markdown(
+            f"""
+            <div class="stage-card">
+                <div class="stage-title">Condensation</div>
+                <div class="stage-temp">{op.lead_splash_temp_C:.0f}°C</div>
+                <div class="{status_class(compliance.lead_splash_temp_within_spec)}">
+                    {"Normal" if compliance.lead_splash_temp_within_spec else "Check"}
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+    with pf_col4:
+        st.markdown(
+            f"""
+            <div class="stage-card">
+                <div class="stage-title">Slag Management</div>
+                <div class="stage-temp">Slag/Feed {compliance.slag_to_feed_ratio*100.0:.1f}%</div>
+                <div class="{status_class(compliance.slag_to_feed_within_limit)}">
+                    {"Normal" if compliance.slag_to_feed_within_limit else "Check"}
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+
+# Compliance table status label for each check result (None: not measured)
+_STATUS_TAG = {None: "N/A", True: "OK", False: "OUT OF SPEC"}
+
+
+@st.cache_data(max_entries=64)
+def compliance_table(
+    compliance: ISFComplianceResult,
+    op: ISFOperatingConditions,
+) -> pd.DataFrame:
+    import pandas as pd
+
+    limits = get_limits()
+    return pd.DataFrame(
+        {
+            "Parameter": [
+                "Slag‑to‑feed ratio",
+                "Residual Zn in slag (wt%)",
+                "Zn product purity (wt%)",
+                "Sinter preheat temperature (°C)",
+                "Blast pressure (bar)",
+                "Lead splash temperature (°C)",
+            ],
+            "Value": [
+                f"{compliance.slag_to_feed_ratio:.3f}",
+                f"{compliance.residual_zn_in_slag_wtfrac*100.0:.2f}",
+                f"{compliance.zinc_product_purity_wtfrac*100.0:.2f}",
+                f"{op.sinter_preheat_temp_C:.1f}",
+                f"{op.blast_pressure_bar:.2f}",
+                f"{op.lead_splash_temp_C:.1f}",
+            ],
+            "Target / Limit": [
+                f"{limits.slag_to_feed_ratio_target:.3f} ± {limits.slag_to_feed_ratio_tol:.3f}",
+                f"< {limits.residual_zn_in_slag_max_wtfrac*100.0:.2f}",
+                f">= {limits.zinc_product_purity_min_wtfrac*100.0:.2f}",
+                f"{limits.sinter_preheat_temp_target_C:.0f} ± {limits.sinter_preheat_temp_tol_C:.0f}",
+                f"{limits.blast_pressure_min_bar:.1f}–{limits.blast_pressure_max_bar:.1f}",
+                f"{limits.lead_splash_temp_min_C:.0f}–{limits.lead_splash_temp_max_C:.0f}",
+            ],
+            "Status": [
+                _STATUS_TAG[ok]
+                for ok in (
+                    compliance.slag_to_feed_within_limit,
+                    compliance.residual_zn_in_slag_within_limit,
+                    compliance.zinc_product_purity_within_spec,
+                    compliance.sinter_preheat_temp_within_spec,
+                    compliance.blast_pressure_within_spec,
+                    compliance.lead_splash_temp_within_spec,
+                )
+            ],
+        }
+    )
+
+
+# The styled page's tables, cached as finished HTML on top of the cached
+# DataFrames above: on a cache hit only a string is sent.
+@st.cache_data(max_entries=64)
+def compliance_html(compliance: ISFComplianceResult, op: ISFOperatingConditions) -> str:
+    return compliance_table(compliance, op).to_html(
+        index=False, classes=["data-table", "compliance-table"], border=0
+    )
+
+
+# Same number formats as the command-line tables
+_STREAM_FORMATTERS = {"Mass (kg/h)": "{:,.1f}".format, "Wt %": "{:.2f}".format}
+
+
+@st.cache_data(max_entries=64)
+def stream_html(name: str, elements_kgph: tuple[float, ...]) -> str:
+    return stream_to_df(name, elements_kgph).to_html(
+        index=False, classes=["data-table", "stream-table"], border=0, formatters=_STREAM_FORMATTERS
+    )
+
+
+def render_compliance_table(compliance: ISFComplianceResult, op: ISFOperatingConditions) -> None:
+    st.markdown(compliance_html(compliance, op), unsafe_allow_html=True)
+
+
+# Stream selector label -> attribute of ISFSimulationResult
+_STREAMS = {
+    "Feed": "feed",
+    "Coke": "coke",
+    "Metal": "metal",
+    "Slag": "slag",
+    "Off‑gas": "gas",
+}
+
+
+def render_streams(result: ISFSimulationResult, styled: bool = True) -> None:
+    """
+    Stream selector plus the selected stream's table: cached HTML styled by
+    the page CSS when ``styled``, otherwise a native ``st.table``.
+    """
+    # A radio instead of st.tabs: tabs build every table on each rerun,
+    # here only the selected stream is converted and rendered.
+    name = st.radio("Stream", list(_STREAMS), horizontal=True, key="stream_tab")
+    # Hashable cache key straight from the model's fixed-order vector
+    elements_kgph = tuple(getattr(result, _STREAMS[name]).elements_kgph.tolist())
+    if styled:
+        st.markdown(stream_html(name, elements_kgph), unsafe_allow_html=True)
+    else:
+        st.table(stream_to_df(name, elements_kgph).style.format(_STREAM_FORMATTERS))
@@ -1,24 +1,33 @@
 from __future__ import annotations
 
-from tabulate import tabulate
+import numpy as np
+import pandas as pd
 
 from isf_simulation import (
+    ELEMENTS,
+    TABLE_ORDER,
     ISFFeed,
     ISFFurnace,
     ISFOperatingConditions,
     ISFOperatingLimits,
+    Stream,
     evaluate_sop_compliance,
 )
 
 
-def print_stream_table(title: str, elements_kgph: dict[str, float]) -> None:
-    rows = []
-    total = sum(elements_kgph.values())
-    for el, m in sorted(elements_kgph.items()):
-        wt_pct = 100.0 * m / total if total > 0 else 0.0
-        rows.append([el, f"{m:,.1f}", f"{wt_pct:6.2f}"])
+def print_stream_table(title: str, stream: Stream) -> None:
+    mass = stream.elements_kgph[TABLE_ORDER]
+    total = mass.sum()
+    df = pd.DataFrame(
+        {
+            "Element": np.asarray(ELEMENTS)[TABLE_ORDER],
+            "Mass (kg/h)": mass,
+            "Wt %": 100.0 * mass / total if total > 0 else 0.0,
+        }
+    )
+    df = df[df["Mass (kg/h)"] != 0.0]
     print(f"\n{title}")
-    print(tabulate(rows, headers=["Element", "Mass (kg/h)", "Wt %"], tablefmt="github"))
+    print(df.to_markdown(index=False, tablefmt="github", floatfmt=("", ",.1f", ".2f")))
     print(f"Total: {total:,.1f} kg/h\n")
 
 
@@ -54,11 +63,11 @@ def main() -> None:
 
     print("=== ISF Furnace Steady‑State Simulation ===")
 
-    print_stream_table("Feed (incl. sinter only)", result.feed.elements_kgph)
-    print_stream_table("Coke", result.coke.elements_kgph)
-    print_stream_table("Metal product", result.metal.elements_kgph)
-    print_stream_table("Slag product", result.slag.elements_kgph)
-    print_stream_table("Off‑gas (elemental basis)", result.gas.elements_kgph)
+    print_stream_table("Feed (incl. sinter only)", result.feed)
+    print_stream_table("Coke", result.coke)
+    print_stream_table("Metal product", result.metal)
+    print_stream_table("Slag product", result.slag)
+    print_stream_table("Off‑gas (elemental basis)", result.gas)
 
     print("=== KPIs ===")
     print(f"Zinc recovery to metal: {result.kpi_zinc_recovery():5.1f} %")
@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from isf_simulation import ISFFeed, ISFFurnace, ISFOperatingConditions
+
+
+class FeedFromArrayTest(unittest.TestCase):
+    def test_builds_composition_in_name_order(self) -> None:
+        feed = ISFFeed.from_array(np.array([0.6, 0.4]), ("Zn", "Si"), 10.0)
+        self.assertEqual(feed.elements_wtfrac, {"Zn": 0.6, "Si": 0.4})
+
+    def test_length_mismatch_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            ISFFeed.from_array(np.array([0.5, 0.3, 0.2]), ("Zn", "Si"), 10.0)
+
+
+class CokeSweepTest(unittest.TestCase):
+    """``simulate_coke_sweep`` must agree with full ``simulate`` runs."""
+
+    def setUp(self) -> None:
+        self.furnace = ISFFurnace()
+        self.feed = ISFFeed(
+            elements_wtfrac={
+                "Zn": 0.40,
+                "Pb": 0.08,
+                "Fe": 0.15,
+                "S": 0.10,
+                "Si": 0.12,
+                "Ca": 0.08,
+                "Mg": 0.03,
+                "O": 0.04,
+            },
+            feed_rate_tph=80.0,
+        )
+
+    def assert_sweep_matches_simulate(self, feed: ISFFeed, coke_rates: np.ndarray) -> None:
+        zn_rec, coke_int, zn_prod = self.furnace.simulate_coke_sweep(feed, coke_rates, 28.0)
+        for i, rate in enumerate(coke_rates):
+            result = self.furnace.simulate(
+                feed,
+                ISFOperatingConditions(
+                    coke_rate_kgph=float(rate),
+                    zn_production_target_tph=30.0,
+                    coke_LHV_MJ_per_kg=28.0,
+                ),
+            )
+            np.testing.assert_allclose(
+                (zn_rec[i], coke_int[i], zn_prod[i]),
+                (
+                    result.kpi_zinc_recovery(),
+                    result.kpi_coke_rate_GJ_per_tZn(),
+                    result.zn_metal_production_tph(),
+                ),
+                rtol=1e-9,
+                err_msg=f"coke rate {rate} kg/h",
+            )
+
+    def test_matches_simulate_over_coke_rates(self) -> None:
+        self.assert_sweep_matches_simulate(self.feed, np.linspace(0.0, 40_000.0, 41))
+
+    def test_feed_without_zinc(self) -> None:
+        feed = ISFFeed(elements_wtfrac={"Si": 0.6, "Ca": 0.4}, feed_rate_tph=10.0)
+        self.assert_sweep_matches_simulate(feed, np.array([0.0, 5_000.0, 20_000.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()